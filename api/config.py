@@ -43,7 +43,8 @@ class APIConfig:
     # Configurações do servidor
     HOST = "0.0.0.0"
     PORT = 9000
-    RELOAD = True
+    RELOAD = os.getenv("RELOAD", "false").lower() == "true"
+    WORKERS = int(os.getenv("WORKERS", os.cpu_count() or 1))
     
     # Informações de contato
     CONTACT_INFO = {
@@ -1,10 +1,12 @@
 import os
 import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi import status as http_status
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 import sys
@@ -13,7 +15,6 @@ from services.dicionarioService import dicionario_service
 from api.models import (
     PalavraRequest,
     BuscaRequest,
-    BuscaResult,
     BuscaResponse,
     StatusResponse,
     EstatisticasResponse,
@@ -25,18 +26,31 @@ from api.config import APIConfig
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Iniciando API do dicionário vetorial...")
-    dicionario_service.inicializar()
+    await dicionario_service.inicializar()
     print("✅ API iniciada com sucesso!")
     yield
     # Shutdown
     print("🛑 Encerrando API...")
+    await dicionario_service.encerrar()
 
 # Configuração detalhada da aplicação FastAPI
 app = FastAPI(
     **APIConfig.get_fastapi_config(),
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Comprime respostas JSON acima de 500 bytes (ex: /buscar com limit alto)
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+# Cache em memória das respostas de /buscar:
+# (query, limit) -> (expira_em, resposta, total_palavras)
+# Invalidado em /adicionar; o total de pontos da coleção valida cada entrada
+# para enxergar inserções feitas por outros workers
+_busca_cache = OrderedDict()
+_BUSCA_CACHE_TTL = 300  # segundos
+_BUSCA_CACHE_MAXSIZE = 1024
+
 @app.get(
     "/",
     tags=["Sistema"],
@@ -122,7 +136,7 @@ async def status():
     * Monitoramento
     * Troubleshooting
     """
-    return dicionario_service.verificar_status()
+    return await dicionario_service.verificar_status()
 
 @app.get(
     "/estatisticas",
@@ -163,7 +177,7 @@ async def estatisticas():
     * Configuração de sistemas
     """
     try:
-        return dicionario_service.obter_estatisticas()
+        return await dicionario_service.obter_estatisticas()
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -185,15 +199,18 @@ async def estatisticas():
                         "query": "local onde alguém vive",
                         "resultados": [
                             {
-                                "palavra": ["casa", "local onde alguém mora"],
+                                "palavra": "casa",
+                                "definicao": "local onde alguém mora",
                                 "score": 0.8945
                             },
                             {
-                                "palavra": ["moradia", "local onde alguém mora, casa, residência"],
+                                "palavra": "moradia",
+                                "definicao": "local onde alguém mora, casa, residência",
                                 "score": 0.8723
                             },
                             {
-                                "palavra": ["lar", "local onde alguém mora"],
+                                "palavra": "lar",
+                                "definicao": "local onde alguém mora",
                                 "score": 0.8456
                             }
                         ]
@@ -228,16 +245,38 @@ async def buscar_palavras(request: BuscaRequest):
     * "lugar para morar" → casa, lar, moradia
     """
     try:
-        resultados_raw = dicionario_service.buscar_palavras(request.query, request.limit)
-        
-        # Formatar resultados
-        resultados = [
-            BuscaResult(palavra=palavra, score=score)
-            for palavra, score in resultados_raw
-        ]
-        
-        return BuscaResponse(query=request.query, resultados=resultados)
-        
+        # Respostas recentes para a mesma (query, limit) saem direto do cache,
+        # desde que o total de pontos não tenha mudado (estatísticas têm cache
+        # próprio de 2s, então inserções de outros workers aparecem em até 2s)
+        total_atual = (await dicionario_service.obter_estatisticas()).get("total_palavras")
+        cache_key = (request.query, request.limit)
+        em_cache = _busca_cache.get(cache_key)
+        if em_cache and em_cache[0] > time.monotonic():
+            if total_atual is not None and em_cache[2] == total_atual:
+                _busca_cache.move_to_end(cache_key)
+                return ORJSONResponse(em_cache[1])
+            del _busca_cache[cache_key]
+
+        resultados_raw = await dicionario_service.buscar_palavras(request.query, request.limit)
+
+        # Monta o payload como dict e responde direto com ORJSONResponse:
+        # os dados já saem do serviço no formato do response_model, então a
+        # re-validação Pydantic no caminho quente seria custo puro
+        content = {
+            "query": request.query,
+            "resultados": [
+                {"palavra": palavra, "definicao": definicao, "score": score}
+                for palavra, definicao, score in resultados_raw
+            ]
+        }
+
+        _busca_cache[cache_key] = (time.monotonic() + _BUSCA_CACHE_TTL, content, total_atual)
+        _busca_cache.move_to_end(cache_key)
+        if len(_busca_cache) > _BUSCA_CACHE_MAXSIZE:
+            _busca_cache.popitem(last=False)
+
+        return ORJSONResponse(content)
+
     except Exception as e:
         raise HTTPException(
             status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -260,7 +299,7 @@ async def buscar_palavras(request: BuscaRequest):
                         "message": "Palavra adicionada com sucesso",
                         "palavra": "cachorro",
                         "definicao": "animal doméstico quadrúpede da família dos canídeos",
-                        "id": 13
+                        "id": "550e8400-e29b-41d4-a716-446655440000"
                     }
                 }
             }
@@ -298,7 +337,11 @@ async def adicionar_palavra(request: PalavraRequest):
     * ✅ "carro: veículo automotor de quatro rodas"
     """
     try:
-        resultado = dicionario_service.adicionar_palavra(request.palavra, request.definicao)
+        resultado = await dicionario_service.adicionar_palavra(request.palavra, request.definicao)
+
+        # Nova palavra pode alterar qualquer resultado de busca em cache
+        _busca_cache.clear()
+
         return resultado
         
     except Exception as e:
@@ -309,8 +352,13 @@ async def adicionar_palavra(request: PalavraRequest):
 
 if __name__ == "__main__":
     uvicorn.run(
-        "dicionarioAPI:app", 
-        host=APIConfig.HOST, 
-        port=APIConfig.PORT, 
-        reload=APIConfig.RELOAD
+        "dicionarioAPI:app",
+        host=APIConfig.HOST,
+        port=APIConfig.PORT,
+        reload=APIConfig.RELOAD,
+        workers=APIConfig.WORKERS,
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=30,
+        limit_concurrency=1000
     )
\ No newline at end of file
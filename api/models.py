@@ -65,10 +65,17 @@ class BuscaRequest(BaseModel):
 
 class BuscaResult(BaseModel):
     """Modelo para resultado individual de busca"""
-    palavra: tuple = Field(
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
+    palavra: str = Field(
+        ...,
+        description="A palavra encontrada",
+        example="casa"
+    )
+    definicao: str = Field(
         ...,
-        description="Tupla contendo a palavra e sua definição",
-        example=["casa", "local onde alguém mora"]
+        description="Definição da palavra",
+        example="local onde alguém mora"
     )
     score: float = Field(
         ...,
@@ -87,11 +94,13 @@ class BuscaResponse(BaseModel):
                 "query": "local onde alguém vive",
                 "resultados": [
                     {
-                        "palavra": ["casa", "local onde alguém mora"],
+                        "palavra": "casa",
+                        "definicao": "local onde alguém mora",
                         "score": 0.8945
                     },
                     {
-                        "palavra": ["moradia", "local onde alguém mora, casa, residência"],
+                        "palavra": "moradia",
+                        "definicao": "local onde alguém mora, casa, residência",
                         "score": 0.8723
                     }
                 ]
@@ -131,7 +140,7 @@ class AdicionarResponse(BaseModel):
                 "message": "Palavra adicionada com sucesso",
                 "palavra": "cachorro",
                 "definicao": "animal doméstico quadrúpede da família dos canídeos",
-                "id": 13
+                "id": "550e8400-e29b-41d4-a716-446655440000"
             }
         }
     )
@@ -139,4 +148,18 @@ class AdicionarResponse(BaseModel):
     message: str = Field(..., description="Mensagem de confirmação")
     palavra: str = Field(..., description="Palavra que foi adicionada")
     definicao: str = Field(..., description="Definição que foi adicionada")
-    id: int = Field(..., description="ID único da palavra na coleção")
\ No newline at end of file
+    id: str = Field(..., description="ID único (UUID) da palavra na coleção")
+
+
+# Força a construção dos core-schemas Pydantic na importação, para que o
+# custo não seja pago na primeira requisição de cada modelo
+for _model in (
+    PalavraRequest,
+    BuscaRequest,
+    BuscaResult,
+    BuscaResponse,
+    StatusResponse,
+    EstatisticasResponse,
+    AdicionarResponse,
+):
+    _model.model_rebuild(force=True)
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+Pré-computa os embeddings dos dados iniciais
+
+Executado durante o build da imagem Docker para que o primeiro start do
+serviço apenas carregue um arquivo .npy, em vez de rodar o modelo sobre
+as palavras iniciais (e de quebra o modelo já fica baixado na imagem).
+
+Uso: python scripts/precompute_seed.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+sys.path.append('.')
+from services.dadosIniciais import PALAVRAS_INICIAIS, SEED_VECTORS_PATH
+
+
+def main():
+    print("📚 Carregando modelo SentenceTransformer...")
+    model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    # Mesma quantização aplicada em DicionarioService._carregar_modelo: os
+    # vetores da seed precisam vir do mesmo modelo que gera os das queries
+    model = torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+    print(f"🔧 Gerando embeddings de {len(PALAVRAS_INICIAIS)} palavras iniciais...")
+    vetores = model.encode([definicao for _, definicao in PALAVRAS_INICIAIS])
+
+    os.makedirs(os.path.dirname(SEED_VECTORS_PATH), exist_ok=True)
+    np.save(SEED_VECTORS_PATH, vetores)
+    print(f"✅ Embeddings salvos em {SEED_VECTORS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
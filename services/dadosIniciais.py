@@ -0,0 +1,33 @@
+"""
+Dados iniciais do Dicionário Vetorial
+
+Palavras de exemplo usadas para popular a coleção no primeiro start,
+e caminho do arquivo de embeddings pré-computados em build time por
+scripts/precompute_seed.py.
+"""
+
+import os
+
+# Palavras exemplo
+PALAVRAS_INICIAIS = [
+    ("banana", "fruta tropical amarela rica em potássio"),
+    ("abacaxi", "fruta tropical com casca áspera e sabor agridoce"),
+    ("lar", "local onde alguém mora"),
+    ("casa", "local onde alguém mora"),
+    ("moradia", "local onde alguém mora, casa, residência"),
+    ("felicidade", "sentimento positivo de alegria e contentamento"),
+    ("tristeza", "sentimento negativo de melancolia e infelicidade"),
+    ("amizade", "relação afetiva entre pessoas baseada em confiança e carinho"),
+    ("melão", "fruta tropical de casca verde e polpa doce"),
+    ("ciúmes", "sentimento de insegurança e possessividade em relação a algo ou alguém"),
+    ("Jacarta", "capital da Indonésia"),
+    ("Brasília", "capital do Brasil"),
+]
+
+# Embeddings pré-computados das definições acima (gerado em build time).
+# No Docker o caminho fica fora de /app (via SEED_VECTORS_PATH), para não
+# ser escondido pelo bind mount de desenvolvimento do docker-compose
+SEED_VECTORS_PATH = os.getenv(
+    "SEED_VECTORS_PATH",
+    os.path.join(os.path.dirname(__file__), "seed_vectors.npy")
+)
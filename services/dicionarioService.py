@@ -1,11 +1,19 @@
+import asyncio
 import os
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 
+from services.dadosIniciais import PALAVRAS_INICIAIS, SEED_VECTORS_PATH
+
 
 class DicionarioService:
     """Serviço responsável por toda a lógica de negócio do dicionário vetorial"""
@@ -14,163 +22,314 @@ class DicionarioService:
         self.client = None
         self.model = None
         self.collection_name = "dicionario_pt"
+        # ef de busca do HNSW: ajuste conforme a distribuição de limit/recall
+        self._hnsw_ef = int(os.getenv("HNSW_EF", "64"))
         self._initialized = False
+        self._encode_pool = None
+        self._embed_cache = OrderedDict()
+        self._embed_cache_maxsize = 4096
+        self._encode_queue = None
+        self._encode_worker = None
+        self._encode_batch_max = 32
+        self._encode_batch_wait = 0.005  # segundos
+        self._status_cache = (0.0, None)
+        self._estatisticas_cache = (0.0, None)
+        self._monitor_cache_ttl = 2.0  # segundos
+        self._monitor_lock = asyncio.Lock()
     
-    def inicializar(self):
+    async def inicializar(self):
         """Inicializa conexão com Qdrant e carrega modelo"""
         if self._initialized:
             return
             
         print("🚀 Inicializando serviço de dicionário vetorial...")
-        self._conectar_qdrant()
+        self._encode_pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        await self._conectar_qdrant()
         self._carregar_modelo()
-        self._inicializar_colecao()
+        self._encode_queue = asyncio.Queue()
+        self._encode_worker = asyncio.create_task(self._encode_em_lote())
+        await self._inicializar_colecao()
         self._initialized = True
         print("✅ Serviço inicializado com sucesso!")
+
+    async def encerrar(self):
+        """Libera o cliente Qdrant e os recursos de encoding na parada"""
+        if self._encode_worker is not None:
+            self._encode_worker.cancel()
+            self._encode_worker = None
+        if self._encode_pool is not None:
+            self._encode_pool.shutdown(wait=False)
+            self._encode_pool = None
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+        self._initialized = False
     
-    def _conectar_qdrant(self):
+    async def _conectar_qdrant(self):
         """Estabelece conexão com Qdrant"""
         host = os.getenv("QDRANT_HOST", "localhost")
         port = int(os.getenv("QDRANT_PORT", "6333"))
+        grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
         
         # Aguarda Qdrant estar disponível
         max_retries = 30
         for attempt in range(max_retries):
             try:
-                self.client = QdrantClient(host=host, port=port)
+                # gRPC para search/upsert: framing binário e menos overhead
+                # por chamada que o transporte REST
+                self.client = AsyncQdrantClient(
+                    host=host,
+                    port=port,
+                    grpc_port=grpc_port,
+                    prefer_grpc=True
+                )
                 # Testa a conexão
-                self.client.get_collections()
+                await self.client.get_collections()
                 print(f"✅ Conectado ao Qdrant em {host}:{port}")
                 break
             except Exception as e:
+                # Fecha o cliente da tentativa falha antes de criar outro,
+                # para não acumular pools de conexão abertos
+                if self.client is not None:
+                    await self.client.close()
+                    self.client = None
                 if attempt < max_retries - 1:
                     print(f"⏳ Aguardando Qdrant... Tentativa {attempt + 1}/{max_retries}")
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                 else:
                     raise Exception(f"❌ Erro ao conectar com Qdrant após {max_retries} tentativas: {e}")
     
     def _carregar_modelo(self):
         """Carrega modelo SentenceTransformer"""
         print("📚 Carregando modelo SentenceTransformer...")
+        # Evita oversubscription de threads quando há múltiplos workers Uvicorn
+        torch.set_num_threads(1)
         self.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+        # Quantização dinâmica int8 das camadas lineares: inferência ~2-4x
+        # mais rápida em CPU com impacto mínimo na qualidade dos embeddings
+        self.model = torch.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
         print("✅ Modelo carregado com sucesso")
+
+    async def _encode(self, texto: str) -> np.ndarray:
+        """Gera embedding float32 do texto sem bloquear o event loop, com cache LRU"""
+        cache = self._embed_cache
+        if texto in cache:
+            cache.move_to_end(texto)
+            return cache[texto]
+
+        future = asyncio.get_running_loop().create_future()
+        await self._encode_queue.put((texto, future))
+        vetor = await future
+
+        cache[texto] = vetor
+        if len(cache) > self._embed_cache_maxsize:
+            cache.popitem(last=False)
+        return vetor
+
+    async def _encode_em_lote(self):
+        """Agrupa pedidos concorrentes de embedding em um único forward pass"""
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._encode_queue.get()]
+            prazo = loop.time() + self._encode_batch_wait
+
+            # Espera brevemente por mais pedidos antes de fechar o lote
+            while len(lote) < self._encode_batch_max:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._encode_queue.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            textos = [texto for texto, _ in lote]
+            try:
+                vetores = await loop.run_in_executor(self._encode_pool, self.model.encode, textos)
+                for (_, future), vetor in zip(lote, vetores):
+                    if not future.done():
+                        # Mantém o vetor como np.float32: o cliente Qdrant
+                        # aceita ndarray, sem converter em floats Python
+                        future.set_result(np.asarray(vetor, dtype=np.float32))
+            except Exception as e:
+                for _, future in lote:
+                    if not future.done():
+                        future.set_exception(e)
     
-    def _inicializar_colecao(self):
+    async def _inicializar_colecao(self):
         """Cria coleção e insere dados iniciais se necessário"""
         try:
             # Verifica se coleção existe
-            collections = self.client.get_collections()
+            collections = await self.client.get_collections()
             collection_exists = any(col.name == self.collection_name for col in collections.collections)
             
             if not collection_exists:
                 print("🔧 Criando coleção e inserindo dados iniciais...")
-                self._criar_colecao_com_dados_iniciais()
+                await self._criar_colecao_com_dados_iniciais()
             else:
                 print("✅ Coleção já existe, usando dados existentes")
-                
+
         except Exception as e:
             print(f"❌ Erro ao inicializar coleção: {e}")
             raise
-    
-    def _criar_colecao_com_dados_iniciais(self):
+
+    async def _criar_colecao_com_dados_iniciais(self):
         """Cria coleção e insere dados iniciais"""
-        # Palavras exemplo
-        palavras = [
-            ("banana", "fruta tropical amarela rica em potássio"),
-            ("abacaxi", "fruta tropical com casca áspera e sabor agridoce"),
-            ("lar", "local onde alguém mora"),
-            ("casa", "local onde alguém mora"),
-            ("moradia", "local onde alguém mora, casa, residência"),
-            ("felicidade", "sentimento positivo de alegria e contentamento"),
-            ("tristeza", "sentimento negativo de melancolia e infelicidade"),
-            ("amizade", "relação afetiva entre pessoas baseada em confiança e carinho"),
-            ("melão", "fruta tropical de casca verde e polpa doce"),
-            ("ciúmes", "sentimento de insegurança e possessividade em relação a algo ou alguém"),
-            ("Jacarta", "capital da Indonésia"),
-            ("Brasília", "capital do Brasil"),
-        ]
-        
-        # Gerar embeddings
-        vetores = self.model.encode([desc for _, desc in palavras])
+        palavras = PALAVRAS_INICIAIS
+
+        # Usa embeddings pré-computados em build time, se disponíveis
+        if os.path.exists(SEED_VECTORS_PATH):
+            print("📦 Usando embeddings pré-computados dos dados iniciais")
+            vetores = np.load(SEED_VECTORS_PATH)
+        else:
+            vetores = self.model.encode([desc for _, desc in palavras])
         
-        # Criar coleção
-        self.client.recreate_collection(
+        # Criar coleção com vetores quantizados (int8) em RAM e originais em
+        # disco. create_collection (e não recreate) evita que dois workers em
+        # cold start se atropelem: o segundo recebe conflito e reutiliza os
+        # dados inseridos pelo primeiro
+        try:
+            await self._criar_colecao(vetores.shape[1])
+        except Exception:
+            collections = await self.client.get_collections()
+            if any(col.name == self.collection_name for col in collections.collections):
+                print("✅ Coleção criada por outro worker, usando dados existentes")
+                return
+            raise
+
+        # Inserir dados em um único lote, com uma única conversão dos vetores
+        await self.client.upsert(
             collection_name=self.collection_name,
-            vectors_config=models.VectorParams(size=vetores.shape[1], distance=models.Distance.COSINE)
+            points=models.Batch(
+                ids=list(range(len(palavras))),
+                vectors=vetores,
+                payloads=[{"palavra": p, "definicao": d} for p, d in palavras]
+            )
         )
-        
-        # Inserir dados
-        self.client.upsert(
+
+        print(f"✅ Inseridas {len(palavras)} palavras no banco vetorial")
+
+    async def _criar_colecao(self, dimensoes: int):
+        """Cria a coleção com quantização int8 e HNSW ajustado"""
+        await self.client.create_collection(
             collection_name=self.collection_name,
-            points=[
-                models.PointStruct(id=i, vector=vetores[i].tolist(), payload={"palavra": palavras[i]})
-                for i in range(len(palavras))
-            ]
+            vectors_config=models.VectorParams(
+                size=dimensoes,
+                distance=models.Distance.COSINE,
+                on_disk=True
+            ),
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            ),
+            hnsw_config=models.HnswConfigDiff(
+                m=16,
+                ef_construct=100,
+                on_disk=False
+            ),
+            optimizers_config=models.OptimizersConfigDiff(memmap_threshold=20000),
+            on_disk_payload=True
         )
-        
-        print(f"✅ Inseridas {len(palavras)} palavras no banco vetorial")
-    
-    def verificar_status(self) -> dict:
+
+    async def verificar_status(self) -> dict:
         """Verifica status da conexão com Qdrant e modelo"""
-        try:
-            collections = self.client.get_collections() if self.client else None
-            return {
-                "status": "ok",
-                "qdrant_conectado": self.client is not None,
-                "colecoes": len(collections.collections) if collections else 0,
-                "modelo_carregado": self.model is not None,
-                "inicializado": self._initialized
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "erro": str(e),
-                "qdrant_conectado": False,
-                "modelo_carregado": self.model is not None,
-                "inicializado": self._initialized
-            }
+        # Cache curto: health checks agressivos não martelam o Qdrant
+        expira_em, resultado = self._status_cache
+        if resultado is not None and expira_em > time.monotonic():
+            return resultado
+
+        async with self._monitor_lock:
+            expira_em, resultado = self._status_cache
+            if resultado is not None and expira_em > time.monotonic():
+                return resultado
+
+            try:
+                collections = await self.client.get_collections() if self.client else None
+                resultado = {
+                    "status": "ok",
+                    "qdrant_conectado": self.client is not None,
+                    "colecoes": len(collections.collections) if collections else 0,
+                    "modelo_carregado": self.model is not None,
+                    "inicializado": self._initialized
+                }
+            except Exception as e:
+                resultado = {
+                    "status": "error",
+                    "erro": str(e),
+                    "qdrant_conectado": False,
+                    "modelo_carregado": self.model is not None,
+                    "inicializado": self._initialized
+                }
+
+            self._status_cache = (time.monotonic() + self._monitor_cache_ttl, resultado)
+            return resultado
     
-    def buscar_palavras(self, query: str, limit: int = 10) -> List[Tuple[Tuple[str, str], float]]:
+    async def buscar_palavras(self, query: str, limit: int = 10) -> List[Tuple[str, str, float]]:
         """Busca palavras semanticamente similares à query"""
         if not self._initialized:
             raise Exception("Serviço não foi inicializado")
         
         # Gerar embedding da query
-        query_vector = self.model.encode([query])[0].tolist()
+        query_vector = await self._encode(query)
         
-        # Buscar no Qdrant
-        result = self.client.search(
+        # Buscar no Qdrant (somente os campos do payload, sem os vetores)
+        result = await self.client.search(
             collection_name=self.collection_name,
             query_vector=query_vector,
-            limit=limit
+            limit=limit,
+            with_payload=["palavra", "definicao"],
+            with_vectors=False,
+            search_params=models.SearchParams(
+                hnsw_ef=self._hnsw_ef,
+                quantization=models.QuantizationSearchParams(
+                    rescore=True,
+                    oversampling=2.0
+                )
+            )
         )
-        
+
         # Formatar resultados
-        return [(r.payload['palavra'], r.score) for r in result]
+        resultados = []
+        for r in result:
+            palavra = r.payload.get('palavra')
+            definicao = r.payload.get('definicao')
+            if definicao is None and isinstance(palavra, (list, tuple)):
+                # Compatibilidade com payloads antigos no formato tupla
+                palavra, definicao = palavra
+            resultados.append((palavra, definicao, r.score))
+        return resultados
     
-    def adicionar_palavra(self, palavra: str, definicao: str) -> dict:
+    async def adicionar_palavra(self, palavra: str, definicao: str) -> dict:
         """Adiciona uma nova palavra ao dicionário"""
         if not self._initialized:
             raise Exception("Serviço não foi inicializado")
         
         # Gerar embedding da definição
-        embedding = self.model.encode([definicao])[0].tolist()
+        embedding = await self._encode(definicao)
         
         # Buscar próximo ID disponível
         novo_id = self._obter_proximo_id()
         
         # Inserir nova palavra
-        self.client.upsert(
+        await self.client.upsert(
             collection_name=self.collection_name,
             points=[
                 models.PointStruct(
                     id=novo_id, 
                     vector=embedding, 
-                    payload={"palavra": (palavra, definicao)}
+                    payload={"palavra": palavra, "definicao": definicao}
                 )
             ]
         )
-        
+
+        # Estatísticas em cache ficaram defasadas com o novo ponto
+        self._estatisticas_cache = (0.0, None)
+
         return {
             "message": "Palavra adicionada com sucesso",
             "palavra": palavra,
@@ -178,35 +337,40 @@ class DicionarioService:
             "id": novo_id
         }
     
-    def _obter_proximo_id(self) -> int:
-        """Obtém o próximo ID disponível para inserção"""
-        # Busca por todos os pontos para encontrar o maior ID
-        scroll_result = self.client.scroll(
-            collection_name=self.collection_name,
-            limit=10000  # Ajuste conforme necessário
-        )
-        
-        max_id = 0
-        if scroll_result[0]:  # Se há pontos na coleção
-            max_id = max(point.id for point in scroll_result[0])
-        
-        return max_id + 1
+    def _obter_proximo_id(self) -> str:
+        """Obtém um ID único para inserção"""
+        # UUIDs não colidem entre workers, ao contrário de um contador em
+        # memória por processo
+        return str(uuid.uuid4())
     
-    def obter_estatisticas(self) -> dict:
+    async def obter_estatisticas(self) -> dict:
         """Obtém estatísticas da coleção"""
         if not self._initialized:
             raise Exception("Serviço não foi inicializado")
         
-        try:
-            collection_info = self.client.get_collection(self.collection_name)
-            return {
-                "nome_colecao": self.collection_name,
-                "total_palavras": collection_info.points_count,
-                "dimensoes_vetor": collection_info.config.params.vectors.size,
-                "distancia": collection_info.config.params.vectors.distance.value
-            }
-        except Exception as e:
-            return {"erro": f"Erro ao obter estatísticas: {str(e)}"}
+        # Cache curto: evita um get_collection por chamada de monitoramento
+        expira_em, resultado = self._estatisticas_cache
+        if resultado is not None and expira_em > time.monotonic():
+            return resultado
+
+        async with self._monitor_lock:
+            expira_em, resultado = self._estatisticas_cache
+            if resultado is not None and expira_em > time.monotonic():
+                return resultado
+
+            try:
+                collection_info = await self.client.get_collection(self.collection_name)
+                resultado = {
+                    "nome_colecao": self.collection_name,
+                    "total_palavras": collection_info.points_count,
+                    "dimensoes_vetor": collection_info.config.params.vectors.size,
+                    "distancia": collection_info.config.params.vectors.distance.value
+                }
+            except Exception as e:
+                return {"erro": f"Erro ao obter estatísticas: {str(e)}"}
+
+            self._estatisticas_cache = (time.monotonic() + self._monitor_cache_ttl, resultado)
+            return resultado
 
 
 # Instância global do serviço